@@ -7,12 +7,13 @@ import tokenize
 import itertools
 import collections
 import dataclasses
-from typing import cast, Iterable, Iterator, Collection, NamedTuple
+from typing import cast, Callable, Iterable, Iterator, Collection, NamedTuple
 from typing_extensions import Protocol
 
 from tuck.ast import Position, _last_token, _first_token
 from asttokens import ASTTokens
-from tuck.wrappers import get_node_bounds, expression_is_parenthesised
+from tuck.wrappers import get_node_bounds
+from asttokens.util import Token
 
 
 class Error(Protocol):
@@ -83,29 +84,43 @@ class PositionsSummary(NamedTuple):
         return self.is_single_line or self.is_single_column
 
 
-def get_start_position(asttokens: ASTTokens, node: ast.AST) -> Position:
+def get_enclosing_parens(
+    asttokens: ASTTokens,
+    node: ast.BoolOp | ast.IfExp,
+) -> tuple[Token, Token] | None:
+    open_paren = asttokens.prev_token(_first_token(node))
+    close_paren = asttokens.next_token(_last_token(node))
+    if open_paren.string == '(' and close_paren.string == ')':
+        return open_paren, close_paren
+    return None
+
+
+def get_start_token(asttokens: ASTTokens, node: ast.AST) -> Token:
     if isinstance(node, ast.GeneratorExp):
         first_token, last_token = get_node_bounds(asttokens, node)
         if first_token.string == '(' and last_token.string == ')':
-            return Position(*first_token.start)
+            return first_token
+
+    if isinstance(node, (ast.BoolOp, ast.IfExp)):
+        parens = get_enclosing_parens(asttokens, node)
+        if parens is not None:
+            open_paren, _ = parens
+            return open_paren
+
+    return _first_token(node)
+
+
+def get_start_position(asttokens: ASTTokens, node: ast.AST) -> Position:
+    return Position(*get_start_token(asttokens, node).start)
 
-    if (
-        isinstance(node, (ast.BoolOp, ast.IfExp)) and
-        expression_is_parenthesised(asttokens, node)
-    ):
-        open_paren = asttokens.prev_token(_first_token(node))
-        return Position(*open_paren.start)
 
-    return Position.from_node_start(node)
+def get_start_line(asttokens: ASTTokens, node: ast.AST) -> int:
+    line: int = get_start_token(asttokens, node).start[0]
+    return line
 
 
 def get_start_positions(asttokens: ASTTokens, nodes: Iterable[ast.AST]) -> list[Position]:
-    positions = []
-    for node in nodes:
-        start = get_start_position(asttokens, node)
-        if start is not None:
-            positions.append(start)
-    return positions
+    return [get_start_position(asttokens, x) for x in nodes]
 
 
 def get_end_position(asttokens: ASTTokens, node: ast.AST) -> Position:
@@ -117,46 +132,143 @@ def get_end_position(asttokens: ASTTokens, node: ast.AST) -> Position:
     return Position(*_last_token(node).end)
 
 
-def get_end_positions(asttokens: ASTTokens, nodes: Iterable[ast.AST]) -> list[Position]:
-    positions = []
-    for node in nodes:
-        end = get_end_position(asttokens, node)
-        if end is not None:
-            positions.append(end)
-    return positions
-
-
-class Visitor(ast.NodeVisitor):
+# Node types which have no handler and cannot contain nodes which do, so there
+# is no need to walk into them.
+_LEAF_NODE_TYPES = frozenset({
+    ast.Name,
+    ast.Constant,
+    ast.Pass,
+    ast.Break,
+    ast.Continue,
+    ast.Global,
+    ast.Nonlocal,
+    ast.alias,
+    *ast.expr_context.__subclasses__(),
+    *ast.boolop.__subclasses__(),
+    *ast.operator.__subclasses__(),
+    *ast.unaryop.__subclasses__(),
+    *ast.cmpop.__subclasses__(),
+})
+
+
+# Node types whose contents we don't check, so there is no need to walk into
+# them.
+_STOP_NODE_TYPES = frozenset({
+    # Position information in f-strings is a mess, so ASTTokens doesn't have
+    # useful information, so we don't try either.
+    ast.JoinedStr,
+})
+
+
+# Walk the tree iteratively rather than recursing. Children are pushed in
+# reverse so that nodes are yielded in the same (depth first, pre-order) order
+# as `ast.NodeVisitor` would visit them.
+def walk(node: ast.AST) -> Iterator[ast.AST]:
+    stack: list[ast.AST] = [node]
+    while stack:
+        node = stack.pop()
+        yield node
+
+        if type(node) in _STOP_NODE_TYPES:
+            continue
+
+        stack.extend(reversed([
+            x
+            for x in ast.iter_child_nodes(node)
+            if type(x) not in _LEAF_NODE_TYPES
+        ]))
+
+
+# Build a lookup, by token index, of the first open paren at or after each
+# token. This avoids scanning the token stream for every definition & call.
+# Tokens with no following open paren map to the end marker, matching the
+# behaviour of `ASTTokens.find_token`.
+def index_open_parens(asttokens: ASTTokens) -> list[Token]:
+    tokens = asttokens.tokens
+    next_open_paren = tokens[-1]
+    open_parens = [next_open_paren] * len(tokens)
+    for i in range(len(tokens) - 1, -1, -1):
+        tok = tokens[i]
+        if tok.type == token.OP and tok.string == '(':
+            next_open_paren = tok
+        open_parens[tok.index] = next_open_paren
+    return open_parens
+
+
+class Visitor:
     def __init__(self, asttokens: ASTTokens) -> None:
-        super().__init__()
         self.asttokens = asttokens
         self.errors: list[Error] = []
+        self._open_parens = index_open_parens(asttokens)
+
+    def handle(self, node: ast.AST) -> None:
+        handler = _HANDLERS.get(type(node))
+        if handler is not None:
+            handler(self, node)
+
+    def _find_open_paren(self, start: Token) -> Token:
+        return self._open_parens[cast(int, start.index)]
+
+    def _find_definition_open_paren(
+        self,
+        node: ast.ClassDef | ast.FunctionDef | ast.AsyncFunctionDef,
+        keyword: str,
+    ) -> Token:
+        start = _first_token(node)
+        if node.decorator_list:
+            # The node starts at its first decorator, which may itself contain
+            # parens, so skip forward to the definition proper.
+            start = self.asttokens.find_token(start, token.NAME, keyword)
+        return self._find_open_paren(start)
 
     def _get_nodes_by_line_number(
         self,
         node: ast.AST,
-        reference: Position,
+        reference_line: int,
         nodes: Collection[ast.AST],
         include_node_end: bool,
         include_node_start: bool = True,
     ) -> dict[int, list[ast.AST]]:
-        by_line_no = collections.defaultdict(list)
+        return self._group_by_line_number(
+            node,
+            reference_line,
+            self._get_start_lines(nodes),
+            include_node_end=include_node_end,
+            include_node_start=include_node_start,
+        )
+
+    def _get_start_lines(self, nodes: Iterable[ast.AST]) -> list[tuple[int, ast.AST]]:
+        return [(get_start_line(self.asttokens, x), x) for x in nodes]
+
+    def _group_by_line_number(
+        self,
+        node: ast.AST,
+        reference_line: int,
+        nodes_with_lines: list[tuple[int, ast.AST]],
+        include_node_end: bool,
+        include_node_start: bool = True,
+    ) -> dict[int, list[ast.AST]]:
+        by_line_no: collections.defaultdict[int, list[ast.AST]] = collections.defaultdict(list)
 
         if include_node_start:
-            by_line_no[reference.line].append(node)
+            by_line_no[reference_line].append(node)
 
-        for x in nodes:
-            pos = get_start_position(self.asttokens, x)
-            by_line_no[pos.line].append(x)
+        for line, x in nodes_with_lines:
+            by_line_no[line].append(x)
 
         if include_node_end:
             end_line, end_col = _last_token(node).end
             just_before_end_pos = Position(end_line, end_col - 1)
-            end_positions = get_end_positions(self.asttokens, nodes)
 
             # Allow hugging, but otherwise add the containing node via its end
-            # line too.
-            if just_before_end_pos not in end_positions or end_line in by_line_no:
+            # line too. The end positions of the nodes are only needed when
+            # nothing else is on the end line, so avoid computing them
+            # otherwise. Only a trailing node can be hugged, so look from the
+            # end and stop at the first match.
+            if end_line in by_line_no or not any(
+                get_end_position(self.asttokens, x) == just_before_end_pos
+                for _, x in reversed(nodes_with_lines)
+            ):
                 by_line_no[end_line].append(node)
 
         return by_line_no
@@ -165,11 +277,13 @@ class Visitor(ast.NodeVisitor):
         self,
         nodes_by_line_number: dict[int, list[ast.AST]],
     ) -> PositionsSummary:
-        counts = {x: len(y) for x, y in nodes_by_line_number.items()}
-        (line_num, max_nodes_per_line), = collections.Counter(counts).most_common(1)
+        line_num, most_common_nodes = max(
+            nodes_by_line_number.items(),
+            key=lambda x: len(x[1]),
+        )
         return PositionsSummary(
-            is_single_line=len(counts) == 1,
-            is_single_column=max_nodes_per_line == 1,
+            is_single_line=len(nodes_by_line_number) == 1,
+            is_single_column=len(most_common_nodes) == 1,
             most_common_line_number=line_num,
         )
 
@@ -186,14 +300,14 @@ class Visitor(ast.NodeVisitor):
     def _check_under_wrapping(
         self,
         node: ast.AST,
-        reference: Position,
+        reference_line: int,
         nodes: Collection[ast.AST],
         include_node_end: bool,
         include_node_start: bool = True,
     ) -> PositionsSummary:
         by_line_no = self._get_nodes_by_line_number(
             node,
-            reference,
+            reference_line,
             nodes,
             include_node_end=include_node_end,
             include_node_start=include_node_start,
@@ -209,16 +323,14 @@ class Visitor(ast.NodeVisitor):
     def visit_ClassDef(self, node: ast.ClassDef) -> None:
         nodes = [*node.bases, *node.keywords]
 
-        class_tok = self.asttokens.find_token(_first_token(node), token.NAME, 'class')
-        open_paren = self.asttokens.find_token(class_tok, token.OP, '(')
+        open_paren = self._find_definition_open_paren(node, 'class')
 
         self._check_under_wrapping(
             node,
-            Position(*open_paren.end),
+            open_paren.end[0],
             nodes,
             include_node_end=False,
         )
-        self.generic_visit(node)
 
     def visit_FunctionDef(self, node: ast.FunctionDef | ast.AsyncFunctionDef) -> None:
         # TODO: also check the positional/args/kwargs markers?
@@ -235,35 +347,39 @@ class Visitor(ast.NodeVisitor):
         if sys.version_info >= (3, 8):
             nodes = [*node.args.posonlyargs, *nodes]
 
-        def_tok = self.asttokens.find_token(_first_token(node), token.NAME, 'def')
-        open_paren = self.asttokens.find_token(def_tok, token.OP, '(')
+        open_paren = self._find_definition_open_paren(node, 'def')
 
         self._check_under_wrapping(
             node,
-            Position(*open_paren.end),
+            open_paren.end[0],
             [x for x in nodes if x],
             include_node_end=False,
         )
-        self.generic_visit(node)
 
     visit_AsyncFunctionDef = visit_FunctionDef
 
     def visit_Call(self, node: ast.Call) -> None:
-        open_paren = self.asttokens.find_token(_last_token(node.func), token.OP, '(')
+        open_paren = self._find_open_paren(_last_token(node.func))
+        reference_line = open_paren.end[0]
 
-        by_line_no = self._get_nodes_by_line_number(
+        # The arguments are grouped several ways below, so find their start
+        # lines just once.
+        args = self._get_start_lines(node.args)
+        kwargs = self._get_start_lines(node.keywords)
+
+        by_line_no = self._group_by_line_number(
             node,
-            Position(*open_paren.end),
-            [*node.args, *node.keywords],
+            reference_line,
+            [*args, *kwargs],
             include_node_end=True,
         )
 
         has_error = False
         if len(by_line_no) > 1:
-            kwargs_by_line_no = self._get_nodes_by_line_number(
+            kwargs_by_line_no = self._group_by_line_number(
                 node,
-                Position(*open_paren.end),
-                node.keywords,
+                reference_line,
+                kwargs,
                 include_node_end=True,
                 include_node_start=not node.args,
             )
@@ -277,10 +393,10 @@ class Visitor(ast.NodeVisitor):
                     kwargs_by_line_no[kwargs_summary.most_common_line_number],
                 )
 
-            pos_args_by_line_no = self._get_nodes_by_line_number(
+            pos_args_by_line_no = self._group_by_line_number(
                 node,
-                Position(*open_paren.end),
-                node.args,
+                reference_line,
+                args,
                 include_node_end=not node.keywords,
                 include_node_start=True,
             )
@@ -313,12 +429,20 @@ class Visitor(ast.NodeVisitor):
                     assert positions
                     self.errors.append(CallUnderWrappedError(node, positions))
 
-        self.generic_visit(node)
+    def _is_single_entry_hugging(self, node: ast.Dict) -> bool:
+        if len(node.values) != 1:
+            return False
+
+        value, = node.values
+        return (
+            Position.from_node_start(value).line == Position.from_node_start(node).line and
+            Position.from_node_end(value).line == Position.from_node_end(node).line
+        )
 
     def visit_Dict(self, node: ast.Dict) -> None:
         by_line_no = self._get_nodes_by_line_number(
             node,
-            Position.from_node_start(node),
+            _first_token(node).start[0],
             [x for x in node.keys if x is not None],
             include_node_end=True,
         )
@@ -333,26 +457,14 @@ class Visitor(ast.NodeVisitor):
         #    42,
         # )}
         # ```
-        def _check_single_entry_hugging() -> bool:
-            if len(node.values) != 1:
-                return False
-
-            value, = node.values
-            return (
-                Position.from_node_start(value).line == Position.from_node_start(node).line and
-                Position.from_node_end(value).line == Position.from_node_end(node).line
-            )
-
         if not summary.is_single_line_or_column:
-            if not _check_single_entry_hugging():
+            if not self._is_single_entry_hugging(node):
                 self._record_error(node, by_line_no[summary.most_common_line_number])
 
-        self.generic_visit(node)
-
     def visit_IfExp(self, node: ast.IfExp) -> None:
         by_line_no = self._get_nodes_by_line_number(
             node,
-            Position.from_node_start(node.body),
+            _first_token(node.body).start[0],
             # TODO: when we get to column validation we're going to need a way
             # to represent syntax here not just AST nodes.
             [node.body, node.test, node.orelse],
@@ -360,10 +472,10 @@ class Visitor(ast.NodeVisitor):
             include_node_start=False,
         )
 
-        if expression_is_parenthesised(self.asttokens, node):
+        parens = get_enclosing_parens(self.asttokens, node)
+        if parens is not None:
             # Also account for the parens
-            open_paren = self.asttokens.prev_token(_first_token(node))
-            close_paren = self.asttokens.next_token(_last_token(node))
+            open_paren, close_paren = parens
 
             open_line = open_paren.start[0]
             close_line = close_paren.start[0]
@@ -377,21 +489,13 @@ class Visitor(ast.NodeVisitor):
         if not summary.is_single_line_or_column:
             self._record_error(node, by_line_no[summary.most_common_line_number])
 
-        self.generic_visit(node)
-
-    def visit_JoinedStr(self, node: ast.JoinedStr) -> None:
-        # Position information in f-strings is a mess, so ASTTokens doesn't have
-        # useful information, so we don't try either.
-        return
-
     def visit_List(self, node: ast.List) -> None:
         self._check_under_wrapping(
             node,
-            Position.from_node_start(node),
+            _first_token(node).start[0],
             node.elts,
             include_node_end=True,
         )
-        self.generic_visit(node)
 
     def visit_Tuple(self, node: ast.Tuple) -> None:
         is_parenthesised = (
@@ -401,18 +505,16 @@ class Visitor(ast.NodeVisitor):
 
         self._check_under_wrapping(
             node,
-            Position.from_node_start(node),
+            _first_token(node).start[0],
             node.elts,
             include_node_end=is_parenthesised,
             include_node_start=is_parenthesised,
         )
 
-        self.generic_visit(node)
-
     def visit_comp(self, node: ast.ListComp | ast.SetComp) -> None:
         summary = self._check_under_wrapping(
             node,
-            Position.from_node_start(node),
+            _first_token(node).start[0],
             [node.elt, *node.generators, *itertools.chain.from_iterable(x.ifs for x in node.generators)],
             include_node_start=False,
             include_node_end=False,
@@ -421,21 +523,18 @@ class Visitor(ast.NodeVisitor):
         if not summary.is_single_line:
             # Ensure that the element from the comprehension is fully on its own
             # line and not overlapping with the generators.
-            elt_end = Position.from_node_end(node.elt)
+            elt_end_line = _last_token(node.elt).start[0]
             generator = node.generators[0]
-            generator_start = Position.from_node_start(generator)
-            if elt_end.line == generator_start.line:
+            if elt_end_line == _first_token(generator).start[0]:
                 self._record_error(node, [node.elt, generator])
 
-        self.generic_visit(node)
-
     visit_ListComp = visit_comp
     visit_SetComp = visit_comp
 
     def visit_DictComp(self, node: ast.DictComp) -> None:
         summary = self._check_under_wrapping(
             node,
-            Position.from_node_start(node),
+            _first_token(node).start[0],
             [node.key, *node.generators, *itertools.chain.from_iterable(x.ifs for x in node.generators)],
             include_node_start=False,
             include_node_end=False,
@@ -444,25 +543,22 @@ class Visitor(ast.NodeVisitor):
         if not summary.is_single_line:
             # Ensure that the `key: value` from the comprehension is fully on
             # its own line and not overlapping with the generators.
-            value_end = Position.from_node_end(node.value)
+            value_end_line = _last_token(node.value).start[0]
             generator = node.generators[0]
-            generator_start = Position.from_node_start(generator)
-            if value_end.line == generator_start.line:
+            if value_end_line == _first_token(generator).start[0]:
                 self._record_error(node, [node.value, generator])
 
-        self.generic_visit(node)
-
     def _check_over_wrapping(
         self,
         node: ast.AST,
-        reference: Position,
+        reference_line: int,
         nodes: Collection[ast.AST],
         include_node_end: bool,
         include_node_start: bool = True,
     ) -> None:
         by_line_no = self._get_nodes_by_line_number(
             node,
-            reference,
+            reference_line,
             nodes,
             include_node_end=include_node_end,
             include_node_start=include_node_start,
@@ -476,11 +572,9 @@ class Visitor(ast.NodeVisitor):
             )
 
     def visit_BoolOp(self, node: ast.BoolOp) -> None:
-        start_pos = Position.from_node_start(node)
-
         by_line_no = self._get_nodes_by_line_number(
             node,
-            start_pos,
+            _first_token(node).start[0],
             node.values,
             include_node_end=False,
             include_node_start=False,
@@ -495,67 +589,85 @@ class Visitor(ast.NodeVisitor):
                 error_type=OverWrappedError,
             )
 
-        elif expression_is_parenthesised(self.asttokens, node):
-            # Also account for the parens
-            open_paren = self.asttokens.prev_token(_first_token(node))
-            close_paren = self.asttokens.next_token(_last_token(node))
-
-            open_line = open_paren.start[0]
-            close_line = close_paren.start[0]
-
-            if (
-                open_line != close_line and
-                (open_line in by_line_no or close_line in by_line_no)
-            ):
-                by_line_no[open_line].append(node)
-                by_line_no[close_line].append(node)
-
-                self._record_error(
-                    node,
-                    [node, *node.values],
-                    error_type=OverWrappedError,
-                )
-
-        self.generic_visit(node)
+        else:
+            parens = get_enclosing_parens(self.asttokens, node)
+            if parens is not None:
+                # Also account for the parens
+                open_paren, close_paren = parens
+
+                open_line = open_paren.start[0]
+                close_line = close_paren.start[0]
+
+                if (
+                    open_line != close_line and
+                    (open_line in by_line_no or close_line in by_line_no)
+                ):
+                    self._record_error(
+                        node,
+                        [node, *node.values],
+                        error_type=OverWrappedError,
+                    )
 
     def visit_UnaryOp(self, node: ast.UnaryOp) -> None:
-        operand_start = get_start_position(self.asttokens, node.operand)
-
-        if node.lineno != operand_start.line:
+        if node.lineno != get_start_line(self.asttokens, node.operand):
             self._record_error(
                 node,
                 [node, node.operand],
                 error_type=OverWrappedError,
             )
 
-        self.generic_visit(node)
-
     def visit_comprehension(self, node: ast.comprehension) -> None:
         self._check_over_wrapping(
             node,
-            Position.from_node_start(node),
+            _first_token(node).start[0],
             [node.target, node.iter],
             include_node_end=False,
             include_node_start=False,
         )
-        self.generic_visit(node)
 
     def visit_Compare(self, node: ast.Compare) -> None:
         self._check_over_wrapping(
             node,
-            Position.from_node_start(node.left),
+            _first_token(node.left).start[0],
             [node.left, *node.comparators],
             include_node_end=False,
             include_node_start=True,
         )
-        self.generic_visit(node)
 
 
-def check(asttokens: ASTTokens) -> list[Error]:
+# Handlers are looked up directly by node type, built once here rather than
+# per-visitor or via attribute lookup for each node visited.
+_HANDLERS: dict[type[ast.AST], Callable[[Visitor, ast.AST], None]] = {
+    x: getattr(Visitor, f'visit_{x.__name__}')
+    for x in (
+        ast.ClassDef,
+        ast.FunctionDef,
+        ast.AsyncFunctionDef,
+        ast.Call,
+        ast.Dict,
+        ast.IfExp,
+        ast.List,
+        ast.Tuple,
+        ast.ListComp,
+        ast.SetComp,
+        ast.DictComp,
+        ast.BoolOp,
+        ast.UnaryOp,
+        ast.comprehension,
+        ast.Compare,
+    )
+}
+
+
+def check(asttokens: ASTTokens) -> Iterator[Error]:
     visitor = Visitor(asttokens)
     assert asttokens.tree  # placate mypy
-    visitor.visit(asttokens.tree)
-    return visitor.errors
+    # Yield errors as they're found rather than collecting them all first.
+    for node in walk(asttokens.tree):
+        visitor.handle(node)
+        if visitor.errors:
+            yield from visitor.errors
+            visitor.errors.clear()
 
 
 def flake8_balanced_wrapping(
@@ -3,12 +3,12 @@ from __future__ import annotations
 import ast
 import textwrap
 import unittest
-from unittest import mock
+from typing import NamedTuple
 
 import asttokens
 
-import flake8_balanced_wrapping
 from flake8_balanced_wrapping import (
+    check,
     Error,
     OverWrappedError,
     UnderWrappedError,
@@ -16,32 +16,60 @@ from flake8_balanced_wrapping import (
 )
 
 
+class _Any:
+    # Like `unittest.mock.ANY`, without needing to import all of `mock`.
+    def __eq__(self, other: object) -> bool:
+        return True
+
+    def __repr__(self) -> str:
+        return '<ANY>'
+
+
+ANY = _Any()
+
+
+class ErrorDescription(NamedTuple):
+    error_type: type[Error]
+    node_type: type[ast.AST] | _Any
+    position: tuple[int, int]
+
+
+def parse(content: str) -> asttokens.ASTTokens:
+    # Normalise from triple quoted strings
+    content = textwrap.dedent(content[1:])
+    return asttokens.ASTTokens(content, parse=True)
+
+
 class TestFlake8BalancedWrapping(unittest.TestCase):
     def assertErrors(
         self,
         content: str,
-        expected_errors: list[tuple[type[Error], type[ast.AST], tuple[int, int]]],
+        expected_errors: list[tuple[type[Error], type[ast.AST] | _Any, tuple[int, int]]],
         *,
         message: str = "Wrong error locations",
     ) -> None:
-        # Normalise from triple quoted strings
-        content = textwrap.dedent(content[1:])
+        errors = list(check(parse(content)))
 
-        errors = flake8_balanced_wrapping.check(
-            asttokens.ASTTokens(content, parse=True),
-        )
         almost_errors = [
-            (type(x), type(x.node), (x.position.line, x.position.col))  # type: ignore[attr-defined]
+            ErrorDescription(
+                type(x),
+                type(x.node),  # type: ignore[attr-defined]
+                (x.position.line, x.position.col),
+            )
             for x in errors
         ]
 
-        self.assertEqual(expected_errors, almost_errors, message)
+        self.assertEqual(
+            [ErrorDescription(*x) for x in expected_errors],
+            almost_errors,
+            message,
+        )
 
     def assertError(
         self,
         content: str,
         expected_error_position: tuple[int, int],
-        expected_error_node: type[ast.AST] = mock.ANY,
+        expected_error_node: type[ast.AST] | _Any = ANY,
         expected_error_type: type[Error] = UnderWrappedError,
         *,
         message: str = "Wrong error locations",
@@ -183,6 +211,17 @@ class TestFlake8BalancedWrapping(unittest.TestCase):
             (2, 4),
         )
 
+    def test_three_line_async_function_def(self) -> None:
+        self.assertError(
+            '''
+            async def func(
+                on, three, *, lines
+            ):
+                pass
+            ''',
+            (2, 4),
+        )
+
     def test_decorated_function_def(self) -> None:
         self.assertOk('''
             @foo
@@ -587,3 +626,9 @@ class TestFlake8BalancedWrapping(unittest.TestCase):
             ast.Compare,
             OverWrappedError,
         )
+
+    def test_fstring_contents_not_checked(self) -> None:
+        self.assertOk('''
+            value = f"""{call(foo,
+                bar)}"""
+        ''')